@@ -1,13 +1,67 @@
 #%%
 import os
 import re
+import numpy as np
 import pandas as pd
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
+
+# Optional Numba backend for outlier flagging (outlier_backend="numba"); compiled on first use
+_OUTLIER_METHOD_CODES = {"mad": 0, "iqr": 1, "zscore": 2}
+_outlier_mask_numba = None
+
+
+def _outlier_mask_kernel(vals, starts, method, thresh, min_reps, out):
+    # `vals` is sorted by group; group i occupies vals[starts[i]:starts[i + 1]]
+    # Serial over groups: the parallel workqueue layer hangs at exit when first launched
+    # from a non-main thread (the GUI runs compute_ddct in a QThread)
+    k_mad = thresh * 1.4826  # MAD consistency constant folded into the threshold
+    for i in range(len(starts) - 1):
+        s = starts[i]
+        e = starts[i + 1]
+        if e - s < min_reps or e == s:
+            continue
+        x = vals[s:e]
+        if method == 0:
+            d = np.abs(x - np.median(x))
+            m = np.median(d)
+            if m > 0:
+                for j in range(e - s):
+                    out[s + j] = d[j] > k_mad * m
+        elif method == 1:
+            q1 = np.percentile(x, 25.0)
+            q3 = np.percentile(x, 75.0)
+            iqr = q3 - q1
+            if iqr > 0:
+                for j in range(e - s):
+                    out[s + j] = x[j] < q1 - thresh * iqr or x[j] > q3 + thresh * iqr
+        else:
+            mu = x.mean()
+            sd = x.std()
+            if sd > 0:
+                for j in range(e - s):
+                    out[s + j] = abs(x[j] - mu) > thresh * sd
+
+
+def _get_outlier_mask_numba():
+    """Return the jitted outlier kernel, or None if numba is not installed."""
+    global _outlier_mask_numba
+    if _outlier_mask_numba is None:
+        try:
+            from numba import njit
+        except ImportError:
+            return None
+        try:
+            _outlier_mask_numba = njit(cache=True)(_outlier_mask_kernel)
+        except RuntimeError:
+            # Frozen (PyInstaller/Nuitka) builds ship no source, so there is no cache locator
+            _outlier_mask_numba = njit(_outlier_mask_kernel)
+    return _outlier_mask_numba
+
 
 def compute_ddct(
     excel_path: str,
-    control_group_regex: str,
-    ref_gene_regex: str,
+    control_group_regex: Union[str, re.Pattern],
+    ref_gene_regex: Union[str, re.Pattern],
     output_path: Optional[str] = None,
     # --- Column mapping (defaults match your spec) ---
     control_search_col: str = "Target",   # where to detect control group (e.g., matches "CTR")
@@ -24,7 +78,10 @@ def compute_ddct(
     outlier_threshold: float = 3.0,        # MAD/z-score: # of robust SDs; IQR: multiplier (1.5–3 typical)
     outlier_min_reps: int = 3,             # require >= this many wells in a (Sample × Gene) group to filter
     record_outliers: bool = True,           # write removed wells to an "outliers" sheet if any
-    enable_outlier_filter: bool = True  # master switch to enable/disable outlier filtering
+    enable_outlier_filter: bool = True,  # master switch to enable/disable outlier filtering
+    outlier_backend: str = "pandas",       # "pandas" or "numba" (JIT-compiled on first use)
+    # --- Numerics ---
+    numeric_dtype=np.float64               # float dtype for Cq/ΔCt/ΔΔCt/Fold Change (np.float32 halves memory)
 ) -> Tuple[pd.DataFrame, pd.DataFrame, str]:
     """
     Compute ΔCt, ΔΔCt and Fold Change (2^−ΔΔCt) from a qPCR Excel file.
@@ -33,12 +90,14 @@ def compute_ddct(
     ----------
     excel_path : str
         Path to input Excel.
-    control_group_regex : str
+    control_group_regex : str or re.Pattern
         Regex that identifies the *control condition* rows (searched in `control_search_col`).
         Example: r"^CTR" matches CTR samples like "CTR-1", "CTR-2".
-    ref_gene_regex : str
+        A precompiled pattern is used as-is (its own flags apply).
+    ref_gene_regex : str or re.Pattern
         Regex that identifies the *reference gene* (searched in `ref_search_col`).
         Example: r"ACTB|B[-_ ]?ACTIN".
+        A precompiled pattern is used as-is (its own flags apply).
     output_path : Optional[str]
         Path for the output Excel. If None, writes next to input as "<stem>_ddct.xlsx".
     control_search_col : str
@@ -56,7 +115,7 @@ def compute_ddct(
     exclude_ref_in_sample_sheet : bool
         If True, sample-sheet means exclude reference gene rows.
     assume_case_insensitive_regex : bool
-        If True, regexes compiled with re.IGNORECASE.
+        If True, regexes compiled with re.IGNORECASE (ignored for precompiled patterns).
     outlier_method : str
         Method for outlier detection on Cq within each (Sample × gene) group.
         One of {"mad", "iqr", "zscore"}. Default "mad".
@@ -70,6 +129,15 @@ def compute_ddct(
         If True, removed outlier wells are saved to an "outliers" sheet in the output Excel.
     enable_outlier_filter : bool
         If False, disables outlier filtering regardless of `outlier_method`.
+    outlier_backend : str
+        "pandas" (default) uses grouped transforms. "numba" uses a JIT-compiled kernel,
+        which only pays off on very large inputs: the first call in a process compiles it
+        (several seconds). Falls back to "pandas" when numba is not installed; any other
+        value raises ValueError.
+    numeric_dtype : numpy dtype
+        Float dtype used for Cq and the derived ΔCt/ΔΔCt/Fold Change columns (default np.float64).
+        np.float32 is ample for Cq (≤ ~40, 0.01 resolution) and halves memory traffic on large
+        inputs, but exported values then carry float32 rounding (e.g. 23.45 → 23.450000762939453).
 
     Returns
     -------
@@ -95,64 +163,66 @@ def compute_ddct(
     - Outlier filtering is applied to Cq within each (Sample × gene) group before computing reference means; groups with < outlier_min_reps are left unfiltered.
     """
 
-    def _flag_outliers(s: pd.Series, method: str, thresh: float) -> pd.Series:
-        s = s.astype(float)
-        if method == "mad":
-            med = s.median()
-            mad = 1.4826 * (s - med).abs().median()
-            if mad == 0 or pd.isna(mad):
-                return pd.Series(False, index=s.index)
-            score = (s - med).abs() / mad
-            return score > thresh
-        elif method == "iqr":
-            q1 = s.quantile(0.25)
-            q3 = s.quantile(0.75)
-            iqr = q3 - q1
-            if iqr == 0 or pd.isna(iqr):
-                return pd.Series(False, index=s.index)
-            lo = q1 - thresh * iqr
-            hi = q3 + thresh * iqr
-            return (s < lo) | (s > hi)
-        elif method == "zscore":
-            mu = s.mean()
-            sd = s.std(ddof=0)
-            if sd == 0 or pd.isna(sd):
-                return pd.Series(False, index=s.index)
-            z = (s - mu).abs() / sd
-            return z > thresh
-        else:
-            return pd.Series(False, index=s.index)
+    def _grouped_mean(keys, vals: np.ndarray) -> pd.Series:
+        # Mean of `vals` per unique key (first-seen order) via integer codes + bincount;
+        # NaN keys form their own group, as with groupby(..., dropna=False)
+        codes, uniques = pd.factorize(keys, sort=False, use_na_sentinel=False)
+        sums = np.bincount(codes, weights=vals, minlength=len(uniques))
+        counts = np.bincount(codes, minlength=len(uniques))
+        return pd.Series((sums / counts).astype(numeric_dtype, copy=False), index=uniques)
+
+    def _lookup(keys: pd.Series, table: pd.Series) -> np.ndarray:
+        # Per-row value of `table` for categorical `keys`, indexed by category codes (NaN if absent).
+        # NaN keys have code -1, which picks the extra last slot: the table's NaN-key entry, if any
+        na_entry = table[table.index.isna()]
+        vals = np.append(
+            table.reindex(keys.cat.categories).to_numpy(),
+            na_entry.iloc[0] if len(na_entry) else np.nan,
+        )
+        return vals[keys.cat.codes.to_numpy()]
 
-    # Load
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    if outlier_backend not in ("pandas", "numba"):
+        raise ValueError(f"outlier_backend must be 'pandas' or 'numba', got {outlier_backend!r}")
 
-    # Basic column checks
+    # Load only the required columns; prefer the Rust-based calamine reader when installed
     required_cols = {control_search_col, ref_search_col, sample_name_col, cq_col, well_col}
+    read_kwargs = dict(sheet_name=sheet_name, usecols=lambda c: c in required_cols)
+    try:
+        df = pd.read_excel(excel_path, engine="calamine", **read_kwargs)
+    except (ImportError, ValueError):
+        # python-calamine missing or pandas too old; the default engine re-raises genuine read errors
+        df = pd.read_excel(excel_path, **read_kwargs)
+
+    # Basic column checks
     missing = required_cols - set(df.columns)
     if missing:
+        present = pd.read_excel(excel_path, sheet_name=sheet_name, nrows=0).columns
         raise ValueError(
             f"Missing required column(s): {sorted(missing)}. "
-            f"Present columns: {sorted(df.columns)}"
+            f"Present columns: {sorted(present)}"
         )
 
     # 0) Strip out rows where Cq is missing or non-numeric
     #    Coerce to numeric; drop NaN
-    df = df.copy()
-    df[cq_col] = pd.to_numeric(df[cq_col], errors="coerce")
+    df[cq_col] = pd.to_numeric(df[cq_col], errors="coerce").astype(numeric_dtype)
     df = df.dropna(subset=[cq_col])
 
     # Normalized text columns for robust matching
     for col in [control_search_col, ref_search_col, sample_name_col]:
         df[col] = df[col].astype(str)
 
-    # Compile regexes
+    # Regex flags
     flags = re.IGNORECASE if assume_case_insensitive_regex else 0
-    control_re = re.compile(control_group_regex, flags)
-    ref_re = re.compile(ref_gene_regex, flags)
+
+    def _regex_mask(col: str, pattern: Union[str, re.Pattern]) -> np.ndarray:
+        # Vectorized regex search; precompiled patterns carry their own flags
+        pat_flags = 0 if isinstance(pattern, re.Pattern) else flags
+        return df[col].str.contains(pattern, flags=pat_flags, regex=True, na=False).to_numpy(dtype=bool)
 
     # Mark reference-gene rows and control-group rows
-    ref_mask = df[ref_search_col].apply(lambda x: bool(ref_re.search(x)))
-    control_mask = df[control_search_col].apply(lambda x: bool(control_re.search(x)))
+    #    (positional boolean arrays so they stay aligned through filtering/merges)
+    ref_mask = _regex_mask(ref_search_col, ref_gene_regex)
+    control_mask = _regex_mask(control_search_col, control_group_regex)
 
     # Sanity check: ensure control regex matched at least one row
     if not control_mask.any():
@@ -163,82 +233,118 @@ def compute_ddct(
         )
 
     # Parse "Group" and "_SampleLabel" from sample_name_col (rsplit by last '-')
-    def _split_group_sample(label: str):
-        if "-" in label:
-            head, _ = label.rsplit("-", 1)
-            return head, label
-        else:
-            # If no '-', treat entire string as the group and sample
-            return label, label
+    #    If no '-', the entire string is used as both group and sample
+    parts = df[sample_name_col].str.rsplit("-", n=1, expand=True)
+    df["Group"] = parts[0].fillna(df[sample_name_col])
+    df["_SampleLabel"] = df[sample_name_col]  # full label like "CTR-1"
 
-    parsed = df[sample_name_col].apply(_split_group_sample)
-    df["Group"] = parsed.apply(lambda t: t[0])
-    df["_SampleLabel"] = parsed.apply(lambda t: t[1])  # full label like "CTR-1"
+    # Key columns as categoricals: groupbys/factorize below reuse the integer codes
+    for col in ["_SampleLabel", "Group", ref_search_col]:
+        df[col] = df[col].astype("category")
 
     # Optional: filter outlier wells by Cq within each (Sample × gene) group
     if enable_outlier_filter:
-        # Only evaluate groups with enough replicates
-        def _group_flag(g: pd.DataFrame) -> pd.Series:
-            if len(g) < outlier_min_reps:
-                return pd.Series(False, index=g.index)
-            return _flag_outliers(g[cq_col], outlier_method.lower(), outlier_threshold)
-
         grp_keys = ["_SampleLabel", ref_search_col]
-        outlier_mask = df.groupby(grp_keys, dropna=False, group_keys=False).apply(_group_flag, include_groups=False)
-        df["_Outlier"] = outlier_mask.reindex(df.index).fillna(False).astype(bool)
+        method = outlier_method.lower()
+        kernel = _get_outlier_mask_numba() if outlier_backend == "numba" and method in _OUTLIER_METHOD_CODES else None
+        if kernel is not None:
+            # Numba: sort rows by group id and flag each contiguous group slice
+            gid = pd.MultiIndex.from_arrays([df[k].array for k in grp_keys]).factorize()[0]
+            order = np.argsort(gid, kind="stable")
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(gid[order])) + 1, [len(gid)]))
+            flagged_sorted = np.zeros(len(gid), dtype=bool)
+            kernel(
+                df[cq_col].to_numpy(dtype=np.float64)[order], starts,
+                _OUTLIER_METHOD_CODES[method], float(outlier_threshold), int(outlier_min_reps),
+                flagged_sorted,
+            )
+            flagged = np.empty_like(flagged_sorted)
+            flagged[order] = flagged_sorted
+            df["_Outlier"] = flagged
+        else:
+            # Column-wide group reductions via transform (no per-group Python calls)
+            g = df.groupby(grp_keys, dropna=False, sort=False, observed=True)[cq_col]
+            cq = df[cq_col]
+            if method == "mad":
+                med = g.transform("median")
+                dev = (cq - med).abs()
+                # Raw median deviation; the 1.4826 consistency constant is folded into the threshold
+                m = dev.groupby([df[k] for k in grp_keys], dropna=False, sort=False, observed=True).transform("median")
+                flagged = (m > 0) & (dev > (outlier_threshold * 1.4826) * m)
+            elif method == "iqr":
+                q1 = g.transform("quantile", 0.25)
+                q3 = g.transform("quantile", 0.75)
+                iqr = q3 - q1
+                flagged = (iqr > 0) & ((cq < q1 - outlier_threshold * iqr) | (cq > q3 + outlier_threshold * iqr))
+            elif method == "zscore":
+                mu = g.transform("mean")
+                sd = g.transform("std", ddof=0)
+                flagged = (sd > 0) & ((cq - mu).abs() > outlier_threshold * sd)
+            else:
+                flagged = pd.Series(False, index=df.index)
+            # Only evaluate groups with enough replicates
+            size = g.transform("size")
+            df["_Outlier"] = (flagged & (size >= outlier_min_reps)).to_numpy(dtype=bool)
 
         # Optionally store removed wells for auditing
-        outliers_df = df.loc[df["_Outlier"], ["Group", "_SampleLabel", ref_search_col, well_col, cq_col]].copy()
+        if record_outliers:
+            outliers_df = df.loc[df["_Outlier"], ["Group", "_SampleLabel", ref_search_col, well_col, cq_col]]
 
         # Drop outliers before ΔCt computation
-        df = df.loc[~df["_Outlier"]].copy()
+        keep = ~df["_Outlier"].to_numpy()
+        df = df.loc[keep].copy()  # own frame: new columns are assigned below (pandas < 3 has no CoW)
+        ref_mask = ref_mask[keep]
+        control_mask = control_mask[keep]
 
     # 1) ΔCt: subtract mean Cq of reference gene for the SAME Sample (_SampleLabel)
     #     Build map: _SampleLabel -> mean(Cq) for reference rows
-    ref_per_sample = (
-        df.loc[ref_mask, ["_SampleLabel", cq_col]]
-          .groupby("_SampleLabel", dropna=False)[cq_col]
-          .mean()
+    ref_per_sample = _grouped_mean(
+        df["_SampleLabel"].array[ref_mask],
+        df[cq_col].to_numpy(dtype=np.float64)[ref_mask],
     )
 
-    # Attach ref mean to all rows by _SampleLabel
-    df = df.merge(ref_per_sample.rename("ref_mean_cq"), left_on="_SampleLabel", right_index=True, how="left")
+    # Per-row ref mean by _SampleLabel (kept as a local array, not a df column)
+    ref_mean = _lookup(df["_SampleLabel"], ref_per_sample)
 
     # Rows without reference-gene mean cannot compute ΔCt
-    if df["ref_mean_cq"].isna().any():
-        missing_samples = sorted(df.loc[df["ref_mean_cq"].isna(), "_SampleLabel"].unique())
+    ref_missing = np.isnan(ref_mean)
+    if ref_missing.any():
+        missing_samples = sorted(df.loc[ref_missing, "_SampleLabel"].unique())
         raise ValueError(
             "Reference-gene Cq mean not found for some samples. "
             f"Ensure each Sample has at least one reference-gene well.\n"
             f"Affected Samples: {missing_samples}"
         )
 
-    df["ΔCt"] = df[cq_col] - df["ref_mean_cq"]
+    # Elementwise math runs on raw ndarrays; columns are assigned once from the results
+    dct = df[cq_col].to_numpy() - ref_mean
+    df["ΔCt"] = dct
 
     # 2) ΔΔCt baseline: mean ΔCt of CONTROL group for the SAME gene (value in ref_search_col)
     #    First, compute per-control-sample mean ΔCt for each gene, then average across control samples.
     # Compute per-control-sample mean ΔCt within controls for each gene (ref_search_col)
-    control_per_sample = (
-        df.loc[control_mask, ["_SampleLabel", ref_search_col, "ΔCt"]]
-          .groupby(["_SampleLabel", ref_search_col], dropna=False)["ΔCt"]
-          .mean()
-          .reset_index()
+    control_per_sample = _grouped_mean(
+        pd.MultiIndex.from_arrays([
+            df["_SampleLabel"].array[control_mask],
+            df[ref_search_col].array[control_mask],
+        ]),
+        dct[control_mask].astype(np.float64, copy=False),
     )
 
     # Then average across control samples for each gene -> global control baseline per gene
-    control_baseline = (
-        control_per_sample
-          .groupby(ref_search_col, dropna=False)["ΔCt"]
-          .mean()
-          .rename("control_mean_ΔCt")
+    #    (reads the gene level of the per-sample MultiIndex directly; no reset_index round trip)
+    control_baseline = _grouped_mean(
+        control_per_sample.index.get_level_values(1),
+        control_per_sample.to_numpy(),
     )
 
-    # Merge per-gene control mean ΔCt
-    df = df.merge(control_baseline, left_on=ref_search_col, right_index=True, how="left")
+    # Per-row control mean ΔCt by gene (kept as a local array, not a df column)
+    ctrl_mean = _lookup(df[ref_search_col], control_baseline)
 
-    if df["control_mean_ΔCt"].isna().any():
+    ctrl_missing = np.isnan(ctrl_mean)
+    if ctrl_missing.any():
         # Some genes lack control data -> cannot compute ΔΔCt for those genes
-        missing_genes = sorted(df.loc[df["control_mean_ΔCt"].isna(), ref_search_col].unique())
+        missing_genes = sorted(df.loc[ctrl_missing, ref_search_col].unique())
         raise ValueError(
             "No control-group rows found for some gene(s). "
             "Add control wells or adjust `control_group_regex` / `control_search_col`.\n"
@@ -246,34 +352,45 @@ def compute_ddct(
         )
 
     # 3) ΔΔCt and Fold Change
-    df["ΔΔCt"] = df["ΔCt"] - df["control_mean_ΔCt"]
-    df["Fold Change"] = 2.0 ** (-df["ΔΔCt"])
+    ddct = dct - ctrl_mean
+    fc = np.negative(ddct)
+    np.exp2(fc, out=fc)
+    df["ΔΔCt"] = ddct
+    df["Fold Change"] = fc
 
     # 4a) Well sheet
     well_cols = ["Group", "_SampleLabel", ref_search_col, well_col, cq_col, "ΔCt", "ΔΔCt", "Fold Change"]
     well_df = (
         df[well_cols]
           .rename(columns={"_SampleLabel": "Sample", ref_search_col: "Gene"})
-          .copy()
           .sort_values(["Gene", "Group", "Sample"], kind="mergesort")
           .reset_index(drop=True)
     )
     # Reorder columns to put Gene first
     col_order = ["Gene", "Group", "Sample", well_col, cq_col, "ΔCt", "ΔΔCt", "Fold Change"]
     well_df = well_df[col_order]
+    # Categoricals are internal only; callers get the same string columns as before
+    well_df[["Gene", "Group", "Sample"]] = well_df[["Gene", "Group", "Sample"]].astype(str)
 
     # 4b) Sample sheet (mean per Sample)
-    sample_source = df[~ref_mask].copy() if exclude_ref_in_sample_sheet else df.copy()
+    sample_source = df[~ref_mask] if exclude_ref_in_sample_sheet else df
     if sample_source.empty:
         raise ValueError(
             "No target-gene rows available for sample-sheet means. "
             "Either your file only contains the reference gene, or the regex filtered everything."
         )
 
+    #     ΔCt and ΔΔCt are linear in Cq within a (Sample × gene) group, so only Cq and
+    #     Fold Change need real reductions; the others are derived from the group means.
     sample_df = (
-        sample_source.groupby(["Group", "_SampleLabel", ref_search_col], dropna=False)[[cq_col, "ΔCt", "ΔΔCt", "Fold Change"]]
+        sample_source.groupby(["Group", "_SampleLabel", ref_search_col], dropna=False, sort=False, observed=True)[[cq_col, "Fold Change"]]
             .mean()
             .reset_index()
+    )
+    sample_df["ΔCt"] = sample_df[cq_col] - _lookup(sample_df["_SampleLabel"], ref_per_sample)
+    sample_df["ΔΔCt"] = sample_df["ΔCt"] - _lookup(sample_df[ref_search_col], control_baseline)
+    sample_df = (
+        sample_df
             .rename(columns={"_SampleLabel": "Sample", ref_search_col: "Gene", cq_col: "Cq"})
             .sort_values(["Gene", "Group", "Sample"], kind="mergesort")
             .reset_index(drop=True)
@@ -281,6 +398,7 @@ def compute_ddct(
     # Reorder columns to put Gene first
     col_order = ["Gene", "Group", "Sample", "Cq", "ΔCt", "ΔΔCt", "Fold Change"]
     sample_df = sample_df[col_order]
+    sample_df[["Gene", "Group", "Sample"]] = sample_df[["Gene", "Group", "Sample"]].astype(str)
 
     # 5) Export
     if output_path is None:
@@ -288,6 +406,8 @@ def compute_ddct(
         root, _ = os.path.splitext(stem)
         output_path = os.path.join(base or ".", f"{root}_ddct.xlsx")
 
+    # Sheets hold one row per well (a few hundred at most), so to_excel's in-memory
+    # workbook is cheap and keeps pandas' header/NaN/inf/datetime handling
     with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
         well_df.to_excel(writer, index=False, sheet_name="well")
         sample_df.to_excel(writer, index=False, sheet_name="sample")
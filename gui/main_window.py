@@ -14,12 +14,13 @@ Run: python /Users/mojackhu/Github/qPCR/gui/main_window.py
 from __future__ import annotations
 
 import os
+import re
 import sys
 import traceback
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QUrl
-from PySide6.QtGui import QDesktopServices
+from PySide6.QtCore import Qt, QUrl, QObject, QThread, QTimer, Signal, Slot
+from PySide6.QtGui import QDesktopServices, QFont, QTextCursor
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QFormLayout, QHBoxLayout, QVBoxLayout, QGridLayout,
     QLineEdit, QPushButton, QFileDialog, QComboBox, QCheckBox, QSpinBox,
@@ -54,110 +55,151 @@ def _parse_sheet_name(text: str):
     return text  # e.g., "Sheet1"
 
 
+class DdctWorker(QObject):
+    """Runs `compute_ddct` off the GUI thread and reports back via signals."""
+
+    finished = Signal(object, object, str)  # well_df, sample_df, output_path
+    error = Signal(str, str)                # message, traceback
+
+    def __init__(self, params: dict) -> None:
+        super().__init__()
+        self._params = params
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            well_df, sample_df, out_path = compute_ddct(**self._params)
+        except Exception as e:
+            self.error.emit(f"{e}", traceback.format_exc())
+        else:
+            self.finished.emit(well_df, sample_df, out_path)
+
+
+# --- i18n tables ----------------------------------------------------------
+# Built once at import time and shared by every MainWindow instance
+_TRANSLATIONS: dict[str, dict[str, str]] = {
+    "zh": {
+        "title": "qPCR 计算器 (by Mojack, v0.1)",
+        "group_paths": "文件路径",
+        "choose_excel": "选择Excel…",
+        "input_excel": "输入Excel:",
+        "save_to": "保存到…",
+        "output_path": "输出路径(可选):",
+        "group_regex": "正则设置",
+        "ctrl_regex": "控制组正则:",
+        "ref_regex": "参考基因正则:",
+        "group_cols": "列映射 & 工作表",
+        "ctrl_col": "控制组所在列:",
+        "ref_col": "基因所在列:",
+        "sample_col": "样本标签所在列:",
+        "cq_col": "Cq列:",
+        "well_col": "孔位列:",
+        "sheet": "工作表 (索引或名称):",
+        "group_flags": "其他选项",
+        "exclude_ref": "样本均值中排除参考基因",
+        "case_ins": "正则忽略大小写",
+        "group_outlier": "异常值过滤 (按每个 样本×基因 的Cq分布)",
+        "runlog": "运行与日志",
+        "enable_outliers": "启用异常值过滤",
+        "outlier_method": "方法:",
+        "outlier_thresh": "阈值:",
+        "outlier_min_reps": "最小重复数:",
+        "record_outliers": "导出被过滤的孔至 'outliers' 工作表",
+        "run": "运行计算",
+        "open_output": "打开输出文件",
+        "log": "日志:",
+        "log_placeholder": "这里显示运行日志与错误信息…",
+        "running": "\n▶️ 正在运行 compute_ddct …",
+        "done": "✅ 完成。结果已写入：{path}",
+        "import_err_title": "导入错误",
+        "import_err_body": "无法导入 compute_ddct: {err}",
+        "path_err_title": "路径错误",
+        "path_err_body": "请先选择有效的输入Excel文件。",
+        "run_fail_title": "运行失败",
+        "out_missing_title": "提示",
+        "out_missing_body": "输出文件不存在。请先运行计算。",
+        "file_filter": "Excel (*.xlsx *.xls);;所有文件 (*.*)",
+        "save_filter": "Excel (*.xlsx)",
+        "lang": "语言:",
+        "lang_cn": "中文",
+        "lang_en": "English",
+    },
+    "en": {
+        "title": "qPCR Calculator (by Mojack, v0.1)",
+        "group_paths": "Paths",
+        "choose_excel": "Choose Excel…",
+        "input_excel": "Input Excel:",
+        "save_to": "Save as…",
+        "output_path": "Output path (optional):",
+        "group_regex": "Regex",
+        "ctrl_regex": "Control-group regex:",
+        "ref_regex": "Reference-gene regex:",
+        "group_cols": "Column mapping & Sheet",
+        "ctrl_col": "Column for control group:",
+        "ref_col": "Column for gene:",
+        "sample_col": "Column for sample label:",
+        "cq_col": "Cq column:",
+        "well_col": "Well column:",
+        "sheet": "Sheet (index or name):",
+        "group_flags": "Other options",
+        "exclude_ref": "Exclude reference gene in sample means",
+        "case_ins": "Ignore case in regex",
+        "group_outlier": "Outlier filtering (per Sample×Gene Cq)",
+        "runlog": "Run & Log",
+        "enable_outliers": "Enable outlier filtering",
+        "outlier_method": "Method:",
+        "outlier_thresh": "Threshold:",
+        "outlier_min_reps": "Min repeats:",
+        "record_outliers": "Export removed wells to 'outliers' sheet",
+        "run": "Run",
+        "open_output": "Open output",
+        "log": "Log:",
+        "log_placeholder": "Logs and errors will appear here…",
+        "running": "\n▶️ Running compute_ddct …",
+        "done": "✅ Done. Wrote results to: {path}",
+        "import_err_title": "Import Error",
+        "import_err_body": "Failed to import compute_ddct: {err}",
+        "path_err_title": "Path Error",
+        "path_err_body": "Please select a valid Excel file first.",
+        "run_fail_title": "Run Failed",
+        "out_missing_title": "Info",
+        "out_missing_body": "Output file not found. Please run first.",
+        "file_filter": "Excel (*.xlsx *.xls);;All files (*.*)",
+        "save_filter": "Excel (*.xlsx)",
+        "lang": "Language:",
+        "lang_cn": "中文",
+        "lang_en": "English",
+    },
+}
+
+
 class MainWindow(QMainWindow):
+    # Shared size policy for all text inputs
+    _LINE_EDIT_POLICY = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         cw = QWidget(self)
         self.setCentralWidget(cw)
+        # Batch all construction-time style/layout changes into one polish/layout pass
+        cw.setUpdatesEnabled(False)
+        self.setUpdatesEnabled(False)
+
+        # Background compute (see _run_compute)
+        self._thread: QThread | None = None
+        self._worker: DdctWorker | None = None
+
+        # Start directory for file dialogs (avoids an empty start dir rescanning "Recent")
+        self._last_dir = ""
 
         # --- i18n ------------------------------------------------------------
         self._lang = "en"  # default language: zh or en
-        self._t = {
-            "zh": {
-                "title": "qPCR 计算器 (by Mojack, v0.1)",
-                "group_paths": "文件路径",
-                "choose_excel": "选择Excel…",
-                "input_excel": "输入Excel:",
-                "save_to": "保存到…",
-                "output_path": "输出路径(可选):",
-                "group_regex": "正则设置",
-                "ctrl_regex": "控制组正则:",
-                "ref_regex": "参考基因正则:",
-                "group_cols": "列映射 & 工作表",
-                "ctrl_col": "控制组所在列:",
-                "ref_col": "基因所在列:",
-                "sample_col": "样本标签所在列:",
-                "cq_col": "Cq列:",
-                "well_col": "孔位列:",
-                "sheet": "工作表 (索引或名称):",
-                "group_flags": "其他选项",
-                "exclude_ref": "样本均值中排除参考基因",
-                "case_ins": "正则忽略大小写",
-                "group_outlier": "异常值过滤 (按每个 样本×基因 的Cq分布)",
-                "runlog": "运行与日志",
-                "enable_outliers": "启用异常值过滤",
-                "outlier_method": "方法:",
-                "outlier_thresh": "阈值:",
-                "outlier_min_reps": "最小重复数:",
-                "record_outliers": "导出被过滤的孔至 'outliers' 工作表",
-                "run": "运行计算",
-                "open_output": "打开输出文件",
-                "log": "日志:",
-                "log_placeholder": "这里显示运行日志与错误信息…",
-                "running": "\n▶️ 正在运行 compute_ddct …",
-                "done": "✅ 完成。结果已写入：{path}",
-                "import_err_title": "导入错误",
-                "import_err_body": "无法导入 compute_ddct: {err}",
-                "path_err_title": "路径错误",
-                "path_err_body": "请先选择有效的输入Excel文件。",
-                "run_fail_title": "运行失败",
-                "out_missing_title": "提示",
-                "out_missing_body": "输出文件不存在。请先运行计算。",
-                "file_filter": "Excel (*.xlsx *.xls);;所有文件 (*.*)",
-                "save_filter": "Excel (*.xlsx)",
-                "lang": "语言:",
-                "lang_cn": "中文",
-                "lang_en": "English",
-            },
-            "en": {
-                "title": "qPCR Calculator (by Mojack, v0.1)",
-                "group_paths": "Paths",
-                "choose_excel": "Choose Excel…",
-                "input_excel": "Input Excel:",
-                "save_to": "Save as…",
-                "output_path": "Output path (optional):",
-                "group_regex": "Regex",
-                "ctrl_regex": "Control-group regex:",
-                "ref_regex": "Reference-gene regex:",
-                "group_cols": "Column mapping & Sheet",
-                "ctrl_col": "Column for control group:",
-                "ref_col": "Column for gene:",
-                "sample_col": "Column for sample label:",
-                "cq_col": "Cq column:",
-                "well_col": "Well column:",
-                "sheet": "Sheet (index or name):",
-                "group_flags": "Other options",
-                "exclude_ref": "Exclude reference gene in sample means",
-                "case_ins": "Ignore case in regex",
-                "group_outlier": "Outlier filtering (per Sample×Gene Cq)",
-                "runlog": "Run & Log",
-                "enable_outliers": "Enable outlier filtering",
-                "outlier_method": "Method:",
-                "outlier_thresh": "Threshold:",
-                "outlier_min_reps": "Min repeats:",
-                "record_outliers": "Export removed wells to 'outliers' sheet",
-                "run": "Run",
-                "open_output": "Open output",
-                "log": "Log:",
-                "log_placeholder": "Logs and errors will appear here…",
-                "running": "\n▶️ Running compute_ddct …",
-                "done": "✅ Done. Wrote results to: {path}",
-                "import_err_title": "Import Error",
-                "import_err_body": "Failed to import compute_ddct: {err}",
-                "path_err_title": "Path Error",
-                "path_err_body": "Please select a valid Excel file first.",
-                "run_fail_title": "Run Failed",
-                "out_missing_title": "Info",
-                "out_missing_body": "Output file not found. Please run first.",
-                "file_filter": "Excel (*.xlsx *.xls);;All files (*.*)",
-                "save_filter": "Excel (*.xlsx)",
-                "lang": "Language:",
-                "lang_cn": "中文",
-                "lang_en": "English",
-            },
-        }
-
-        self.setWindowTitle(self._t[self._lang]["title"])
+        self._t = _TRANSLATIONS
+
+        self._t_current = self._t[self._lang]  # active table, refreshed by _apply_i18n
+        self._i18n_pending = False  # set while a deferred _flush_i18n is queued
+
+        self.setWindowTitle(self._t_current["title"])
         self.resize(980, 720)
 
         # --- Widgets ---------------------------------------------------------
@@ -183,16 +225,16 @@ class MainWindow(QMainWindow):
         self.le_well_col = QLineEdit("Well")
         self.le_sheet = QLineEdit("0")  # sheet index or name
 
-        # Make text inputs longer and expandable
-        from PySide6.QtWidgets import QSizePolicy
-        _expanding = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        for _w in [
-            self.le_input, self.le_output, self.le_ctrl_regex, self.le_ref_regex,
-            self.le_control_search_col, self.le_ref_search_col, self.le_sample_name_col,
-            self.le_cq_col, self.le_well_col, self.le_sheet
-        ]:
-            _w.setMinimumWidth(420)
-            _w.setSizePolicy(_expanding)
+        # Make text inputs expandable, with a compact minimum width (single pass)
+        LINE_EDITS = (
+            self.le_input, self.le_output,
+            self.le_ctrl_regex, self.le_ref_regex,
+            self.le_control_search_col, self.le_ref_search_col,
+            self.le_sample_name_col, self.le_cq_col, self.le_well_col, self.le_sheet,
+        )
+        for _w in LINE_EDITS:
+            _w.setSizePolicy(self._LINE_EDIT_POLICY)
+            _w.setMinimumWidth(210)
 
         # Flags
         self.cb_exclude_ref = QCheckBox("")
@@ -230,7 +272,8 @@ class MainWindow(QMainWindow):
         self.cmb_lang.setCurrentIndex(1 if self._lang == "en" else 0)
         self.cmb_lang.currentIndexChanged.connect(self._on_lang_changed)
         lang_row = QHBoxLayout()
-        lang_row.addWidget(QLabel(self._t[self._lang]["lang"]))
+        self.lbl_lang = QLabel(self._t_current["lang"])
+        lang_row.addWidget(self.lbl_lang)
         lang_row.addWidget(self.cmb_lang)
         lang_row.addStretch(1)
 
@@ -303,15 +346,6 @@ class MainWindow(QMainWindow):
             _f.setContentsMargins(8, 8, 8, 8)
             _f.setHorizontalSpacing(8)
             _f.setVerticalSpacing(6)
-        # Reduce minimum width of all QLineEdit fields
-        for _w in [
-            self.le_input, self.le_output,
-            self.le_ctrl_regex, self.le_ref_regex,
-            self.le_control_search_col, self.le_ref_search_col,
-            self.le_sample_name_col, self.le_cq_col, self.le_well_col, self.le_sheet,
-        ]:
-            _w.setMinimumWidth(210)
-
         btn_row = QHBoxLayout()
         self.btn_run = QPushButton("")
         self.btn_run.clicked.connect(self._run_compute)
@@ -323,7 +357,6 @@ class MainWindow(QMainWindow):
         btn_row.addStretch(1)
 
         # Enlarge Run & Open output buttons, bold text
-        from PySide6.QtGui import QFont
         big_font = self.btn_run.font()
         big_font.setPointSize(big_font.pointSize() + 4)
         big_font.setBold(True)
@@ -332,13 +365,17 @@ class MainWindow(QMainWindow):
         self.btn_run.setMinimumHeight(40)
         self.btn_open_output.setMinimumHeight(40)
 
-        # Compact button style
+        # Compact button style; scoped to the two buttons so the rest of the window keeps
+        # the native style (a window-level sheet would route every widget through QStyleSheetStyle)
         btn_style = "QPushButton { padding: 4px 8px; }"
         self.btn_run.setStyleSheet(btn_style)
         self.btn_open_output.setStyleSheet(btn_style)
 
         self.log = QTextEdit()
         self.log.setReadOnly(True)
+        # Bounded, undo-free document keeps appends cheap as the log grows
+        self.log.document().setMaximumBlockCount(2000)
+        self.log.setUndoRedoEnabled(False)
 
         self.lbl_log = QLabel("")
 
@@ -380,18 +417,82 @@ class MainWindow(QMainWindow):
 
         cw.setLayout(grid)
 
+        # --- i18n targets: (setter, translation key), applied by _apply_i18n ----
+        self._i18n_setters = (
+            (self.setWindowTitle, "title"),
+            # group titles
+            (self.paths_box.setTitle, "group_paths"),
+            (self.regex_box.setTitle, "group_regex"),
+            (self.cols_box.setTitle, "group_cols"),
+            (self.flags_box.setTitle, "group_flags"),
+            (self.outlier_box.setTitle, "group_outlier"),
+            (self.run_box.setTitle, "runlog"),
+            # buttons/checkboxes
+            (self.btn_browse_in.setText, "choose_excel"),
+            (self.btn_browse_out.setText, "save_to"),
+            (self.cb_exclude_ref.setText, "exclude_ref"),
+            (self.cb_case_ins.setText, "case_ins"),
+            (self.cb_enable_outliers.setText, "enable_outliers"),
+            (self.cb_record_outliers.setText, "record_outliers"),
+            (self.btn_run.setText, "run"),
+            (self.btn_open_output.setText, "open_output"),
+            (self.lbl_log.setText, "log"),
+            # log placeholder
+            (self.log.setPlaceholderText, "log_placeholder"),
+            # form labels
+            (self.lbl_input_excel.setText, "input_excel"),
+            (self.lbl_output_path.setText, "output_path"),
+            (self.lbl_ctrl_regex.setText, "ctrl_regex"),
+            (self.lbl_ref_regex.setText, "ref_regex"),
+            (self.lbl_ctrl_col.setText, "ctrl_col"),
+            (self.lbl_ref_col.setText, "ref_col"),
+            (self.lbl_sample_col.setText, "sample_col"),
+            (self.lbl_cq_col.setText, "cq_col"),
+            (self.lbl_well_col.setText, "well_col"),
+            (self.lbl_sheet.setText, "sheet"),
+            (self.lbl_outlier_method.setText, "outlier_method"),
+            (self.lbl_outlier_thresh.setText, "outlier_thresh"),
+            (self.lbl_outlier_min_reps.setText, "outlier_min_reps"),
+            # language row label
+            (self.lbl_lang.setText, "lang"),
+        )
+        self._last_i18n: dict[int, str] = {}  # index in _i18n_setters -> last applied text
+
         # initialize enabled state
         self._toggle_outlier_widgets(self.cb_enable_outliers.isChecked())
         self._apply_i18n()
-        self._apply_group_title_fonts()
+        # Bold, larger group titles; built and applied once (text changes don't affect it).
+        # Size matches what the old two +2 passes produced at startup: max(10, pt + 2) + 2
+        self._title_font = QFont(self.font())
+        self._title_font.setPointSize(max(12, self.font().pointSize() + 4))
+        self._title_font.setBold(True)
+        for box in (self.paths_box, self.regex_box, self.cols_box, self.flags_box, self.outlier_box, self.run_box):
+            box.setFont(self._title_font)
+        # Inner widgets to shrink: everything inside the option boxes (except group boxes and
+        # the big action buttons) plus the log label and log view in Run & Log
+        shrink_targets = [self.paths_box, self.regex_box, self.cols_box, self.flags_box, self.outlier_box]
+        self._shrink_widgets = [
+            w for box in shrink_targets for w in box.findChildren(QWidget)
+            if not isinstance(w, QGroupBox) and w not in (self.btn_run, self.btn_open_output)
+        ] + [self.lbl_log, self.log]
+        # One point below the group titles these widgets used to inherit from; keep it readable
+        self._small_font = QFont(self.font())
+        self._small_font.setPointSize(max(9, self._title_font.pointSize() - 1))
+        self._small_font.setBold(False)
         self._apply_inner_font_style()
 
+        cw.setUpdatesEnabled(True)
+        self.setUpdatesEnabled(True)
+        cw.layout().activate()
+
     # --- Slots ---------------------------------------------------------------
     def _pick_input(self) -> None:
-        t = self._t[self._lang]
-        path, _ = QFileDialog.getOpenFileName(self, t["choose_excel"], "", t["file_filter"])
+        t = self._t_current
+        start = self._last_dir or os.path.expanduser("~")
+        path, _ = QFileDialog.getOpenFileName(self, t["choose_excel"], start, t["file_filter"])
         if not path:
             return
+        self._last_dir = os.path.dirname(path)
         self.le_input.setText(path)
         # suggest default output next to input
         base = os.path.dirname(path)
@@ -401,21 +502,29 @@ class MainWindow(QMainWindow):
             self.le_output.setText(default_out)
 
     def _pick_output(self) -> None:
-        t = self._t[self._lang]
+        t = self._t_current
         # Let user pick a save path (xlsx)
-        path, _ = QFileDialog.getSaveFileName(self, t["save_to"], self.le_output.text().strip() or "", t["save_filter"])
+        start = self.le_output.text().strip() or self._last_dir or os.path.expanduser("~")
+        path, _ = QFileDialog.getSaveFileName(self, t["save_to"], start, t["save_filter"])
         if path:
+            self._last_dir = os.path.dirname(path)
             # ensure .xlsx extension
             if not path.lower().endswith(".xlsx"):
                 path += ".xlsx"
             self.le_output.setText(path)
 
+    def _log_append(self, msg: str) -> None:
+        # Insert at the end instead of QTextEdit.append to avoid re-laying out the whole document
+        self.log.moveCursor(QTextCursor.End)
+        self.log.textCursor().insertText(msg + "\n")
+        self.log.ensureCursorVisible()
+
     def _toggle_outlier_widgets(self, enabled: bool) -> None:
         for w in (self.cmb_outlier_method, self.sb_outlier_thresh, self.sb_outlier_min_reps, self.cb_record_outliers):
             w.setEnabled(enabled)
 
     def _open_output(self) -> None:
-        t = self._t[self._lang]
+        t = self._t_current
         path = self.le_output.text().strip()
         if path and os.path.exists(path):
             QDesktopServices.openUrl(QUrl.fromLocalFile(path))
@@ -423,7 +532,7 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, t["out_missing_title"], t["out_missing_body"])
 
     def _run_compute(self) -> None:
-        t = self._t[self._lang]
+        t = self._t_current
         if compute_ddct is None:
             QMessageBox.critical(self, t["import_err_title"], t["import_err_body"].format(err=_import_error))
             return
@@ -455,129 +564,111 @@ class MainWindow(QMainWindow):
 
         output_path = self.le_output.text().strip() or None
 
-        self.log.append(t["running"])
-        QApplication.setOverrideCursor(Qt.WaitCursor)
+        # Compile regexes once here; compute_ddct uses precompiled patterns as-is
+        flags = re.IGNORECASE if case_ins else 0
         try:
-            well_df, sample_df, out_path = compute_ddct(
-                excel_path=excel_path,
-                control_group_regex=control_group_regex,
-                ref_gene_regex=ref_gene_regex,
-                output_path=output_path,
-                control_search_col=control_search_col,
-                ref_search_col=ref_search_col,
-                sample_name_col=sample_name_col,
-                cq_col=cq_col,
-                well_col=well_col,
-                sheet_name=sheet_name,
-                exclude_ref_in_sample_sheet=exclude_ref,
-                assume_case_insensitive_regex=case_ins,
-                outlier_method=outlier_method,
-                outlier_threshold=outlier_threshold,
-                outlier_min_reps=outlier_min_reps,
-                record_outliers=record_outliers,
-                enable_outlier_filter=enable_outlier_filter,
-            )
-        except Exception as e:
-            QApplication.restoreOverrideCursor()
-            tb = traceback.format_exc()
-            self.log.append(f"❌ 运行失败：{e}\n{tb}")
+            ctrl_pat = re.compile(control_group_regex, flags)
+            ref_pat = re.compile(ref_gene_regex, flags)
+        except re.error as e:
+            self._log_append(f"❌ 运行失败：{e}")
             QMessageBox.critical(self, t["run_fail_title"], f"{e}")
             return
-        finally:
-            if QApplication.overrideCursor() is not None:
-                QApplication.restoreOverrideCursor()
 
+        params = dict(
+            excel_path=excel_path,
+            control_group_regex=ctrl_pat,
+            ref_gene_regex=ref_pat,
+            output_path=output_path,
+            control_search_col=control_search_col,
+            ref_search_col=ref_search_col,
+            sample_name_col=sample_name_col,
+            cq_col=cq_col,
+            well_col=well_col,
+            sheet_name=sheet_name,
+            exclude_ref_in_sample_sheet=exclude_ref,
+            assume_case_insensitive_regex=case_ins,
+            outlier_method=outlier_method,
+            outlier_threshold=outlier_threshold,
+            outlier_min_reps=outlier_min_reps,
+            record_outliers=record_outliers,
+            enable_outlier_filter=enable_outlier_filter,
+        )
+
+        self._log_append(t["running"])
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        self.btn_run.setEnabled(False)
+
+        # Run in a worker thread so the UI stays responsive; results come back via signals
+        self._thread = QThread(self)
+        self._worker = DdctWorker(params)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self._on_compute_done)
+        self._worker.error.connect(self._on_compute_error)
+        self._worker.finished.connect(self._thread.quit)
+        self._worker.error.connect(self._thread.quit)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.finished.connect(self._thread.deleteLater)
+        self._thread.finished.connect(self._on_thread_finished)
+        self._thread.start()
+
+    def _on_compute_done(self, well_df, sample_df, out_path: str) -> None:
+        t = self._t_current
+        QApplication.restoreOverrideCursor()
+        self.btn_run.setEnabled(True)
         self.le_output.setText(out_path)
         self.btn_open_output.setEnabled(True)
-        self.log.append(t["done"].format(path=out_path))
+        self._log_append(t["done"].format(path=out_path))
+
+    def _on_compute_error(self, msg: str, tb: str) -> None:
+        t = self._t_current
+        QApplication.restoreOverrideCursor()
+        self.btn_run.setEnabled(True)
+        self._log_append(f"❌ 运行失败：{msg}\n{tb}")
+        QMessageBox.critical(self, t["run_fail_title"], msg)
+
+    def _on_thread_finished(self) -> None:
+        self._thread = None
+        self._worker = None
+
+    def closeEvent(self, event) -> None:
+        # Let a running computation finish before the thread object is destroyed
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+        super().closeEvent(event)
 
     def _apply_i18n(self) -> None:
         t = self._t[self._lang]
-        self.setWindowTitle(t["title"])
-        # group titles
-        self.paths_box.setTitle(t["group_paths"]) 
-        self.regex_box.setTitle(t["group_regex"]) 
-        self.cols_box.setTitle(t["group_cols"]) 
-        self.flags_box.setTitle(t["group_flags"]) 
-        self.outlier_box.setTitle(t["group_outlier"]) 
-        self.run_box.setTitle(t["runlog"])
-        # buttons/checkboxes
-        self.btn_browse_in.setText(t["choose_excel"]) 
-        self.btn_browse_out.setText(t["save_to"]) 
-        self.cb_exclude_ref.setText(t["exclude_ref"]) 
-        self.cb_case_ins.setText(t["case_ins"]) 
-        self.cb_enable_outliers.setText(t["enable_outliers"]) 
-        self.cb_record_outliers.setText(t["record_outliers"]) 
-        self.btn_run.setText(t["run"]) 
-        self.btn_open_output.setText(t["open_output"]) 
-        self.lbl_log.setText(t["log"]) 
-        # log placeholder
-        self.log.setPlaceholderText(t["log_placeholder"])
-        # form labels
-        self.lbl_input_excel.setText(t["input_excel"]) 
-        self.lbl_output_path.setText(t["output_path"]) 
-        self.lbl_ctrl_regex.setText(t["ctrl_regex"]) 
-        self.lbl_ref_regex.setText(t["ref_regex"]) 
-        self.lbl_ctrl_col.setText(t["ctrl_col"]) 
-        self.lbl_ref_col.setText(t["ref_col"]) 
-        self.lbl_sample_col.setText(t["sample_col"]) 
-        self.lbl_cq_col.setText(t["cq_col"]) 
-        self.lbl_well_col.setText(t["well_col"]) 
-        self.lbl_sheet.setText(t["sheet"]) 
-        self.lbl_outlier_method.setText(t["outlier_method"]) 
-        self.lbl_outlier_thresh.setText(t["outlier_thresh"]) 
-        self.lbl_outlier_min_reps.setText(t["outlier_min_reps"]) 
-        # language row label
-        # Update language label next to combobox
-        lang_label = self.cmb_lang.parent().layout().itemAt(0).widget()
-        if isinstance(lang_label, QLabel):
-            lang_label.setText(t["lang"]) 
-        self._apply_group_title_fonts()
-
-
-    def _apply_group_title_fonts(self) -> None:
-        from PySide6.QtGui import QFont
-        boxes = [self.paths_box, self.regex_box, self.cols_box, self.flags_box, self.outlier_box, self.run_box]
-        for box in boxes:
-            f = box.font()
-            f.setPointSize(max(10, f.pointSize() + 2))
-            f.setBold(True)
-            box.setFont(f)
+        self._t_current = t
+        # Only touch widgets whose text actually changed (each setter invalidates style/layout)
+        for i, (setter, key) in enumerate(self._i18n_setters):
+            val = t[key]
+            if self._last_i18n.get(i) != val:
+                setter(val)
+                self._last_i18n[i] = val
 
     def _apply_inner_font_style(self) -> None:
         """Make inner widgets' fonts smaller and not bold, while keeping
         group titles and the Run/Open buttons styled separately."""
-        from PySide6.QtGui import QFont
-        shrink_targets = [self.paths_box, self.regex_box, self.cols_box, self.flags_box, self.outlier_box]
-        for box in shrink_targets:
-            for w in box.findChildren(QWidget):
-                # Do not touch group boxes (titles) or the big action buttons
-                if isinstance(w, QGroupBox):
-                    continue
-                if w is self.btn_run or w is self.btn_open_output:
-                    continue
-                f = w.font()
-                # Reduce size slightly but keep it readable
-                new_pt = max(9, f.pointSize() - 1 if f.pointSize() > 0 else 9)
-                f.setPointSize(new_pt)
-                f.setBold(False)
-                w.setFont(f)
-        # Also shrink fonts inside Run & Log (except the big buttons)
-        # 3a) Log label
-        f_lbl = self.lbl_log.font()
-        new_pt_lbl = max(9, f_lbl.pointSize() - 1 if f_lbl.pointSize() > 0 else 9)
-        f_lbl.setPointSize(new_pt_lbl)
-        f_lbl.setBold(False)
-        self.lbl_log.setFont(f_lbl)
-        # 3b) Log QTextEdit font
-        f_log = self.log.font()
-        new_pt_log = max(9, f_log.pointSize() - 1 if f_log.pointSize() > 0 else 9)
-        f_log.setPointSize(new_pt_log)
-        f_log.setBold(False)
-        self.log.setFont(f_log)
+        # Targets and font are computed once in __init__; one shared QFont for all widgets
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+        for w in self._shrink_widgets:
+            w.setFont(self._small_font)
+        self.setUpdatesEnabled(updates_enabled)
 
     def _on_lang_changed(self, idx: int) -> None:
         self._lang = "zh" if idx == 0 else "en"
+        # Defer to the event loop so rapid toggles collapse into one reapply
+        if not self._i18n_pending:
+            self._i18n_pending = True
+            QTimer.singleShot(0, self._flush_i18n)
+
+    def _flush_i18n(self) -> None:
+        if not self._i18n_pending:
+            return
+        self._i18n_pending = False
         self._apply_i18n()
 
 
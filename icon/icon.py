@@ -2,11 +2,16 @@
 from PIL import Image
 
 # Load your PNG icon
-img = Image.open("icon.png")
+base = Image.open("icon.png").convert("RGBA")
+
+# Pre-resize every ICO frame once with a high-quality filter instead of relying on
+# PIL's implicit per-frame downscaling
+sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
+frames = [base.resize(s, Image.Resampling.LANCZOS) for s in sizes]
 
 # Save as ICO (for Windows)
-img.save("icon.ico", format='ICO', sizes=[(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)])
+frames[-1].save("icon.ico", format='ICO', sizes=sizes, append_images=frames[:-1])
 
-# Save as ICNS (for macOS)
-img.save("icon.icns", format='ICNS')
+# Save as ICNS (for macOS); keep the full-resolution source so the 512/1024 entries stay sharp
+base.save("icon.icns", format='ICNS')
 # %%
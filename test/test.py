@@ -1,20 +1,21 @@
 import sys
+from importlib.util import find_spec
 from PySide6 import __version__ as PYSIDE_VER
-from PySide6.QtCore import QUrl
+from PySide6.QtCore import QCoreApplication, Qt, QUrl
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QStackedWidget, QLabel
 )
 
-# Try to import WebEngine safely; fall back if unavailable
-try:
-    from PySide6.QtWebEngineWidgets import QWebEngineView  # type: ignore
-    HAS_WEBENGINE = True
-except Exception:
-    QWebEngineView = None  # type: ignore
-    HAS_WEBENGINE = False
+# Only check that WebEngine is installed; importing it loads QtWebEngineCore and the
+# Chromium helper process, so the real import is deferred to the first button click
+HAS_WEBENGINE = find_spec("PySide6.QtWebEngineWidgets") is not None
 
 
 def main():
+    # WebEngine needs shared GL contexts set before the application object exists,
+    # even though the module itself is only imported later
+    if HAS_WEBENGINE:
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
 
     # Root window
@@ -31,13 +32,21 @@ def main():
     placeholder.setWordWrap(True)
     stack.addWidget(placeholder)  # index 0
 
-    # Optional: WebEngine page (only if import succeeded)
+    # Optional: WebEngine page, created on first use
     web = None
-    if HAS_WEBENGINE and QWebEngineView is not None:
-        web = QWebEngineView()
-        stack.addWidget(web)  # index 1
+    if HAS_WEBENGINE:
         def show_web():
-            stack.setCurrentIndex(1)
+            nonlocal web
+            if web is None:
+                try:
+                    from PySide6.QtWebEngineWidgets import QWebEngineView  # type: ignore
+                except Exception:
+                    btn.setText("QtWebEngine not available in this environment")
+                    btn.setEnabled(False)
+                    return
+                web = QWebEngineView()
+                stack.addWidget(web)  # index 1
+            stack.setCurrentIndex(stack.indexOf(web))
             web.setUrl(QUrl("https://en.wikipedia.org"))
         btn.clicked.connect(show_web)
         btn.setEnabled(True)
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.compute import compute_ddct  # noqa: E402
+
+DATA = PROJECT_ROOT / "data" / "test.xlsx"
+
+
+@pytest.mark.parametrize("backend", ["pandas", "numba"])
+def test_blank_sample_label_raises_missing_reference(tmp_path, backend):
+    # A measured target-gene well with a blank sample label has no reference mean; it must
+    # not borrow another sample's (NaN keys have category code -1)
+    df = pd.read_excel(DATA)
+    row = df.index[df["Well"] == "C04"][0]
+    df.loc[row, ["Sample", "Target", "Cq"]] = ["MFN1", np.nan, 25.0]
+    path = tmp_path / "blank_label.xlsx"
+    df.to_excel(path, index=False)
+
+    with pytest.raises(ValueError, match="Reference-gene Cq mean not found"):
+        compute_ddct(str(path), "CTR", "B-ACTIN", output_path=str(tmp_path / "out.xlsx"), outlier_backend=backend)
+
+
+@pytest.mark.parametrize("backend", ["Numba", "numb", ""])
+def test_unknown_outlier_backend_raises(tmp_path, backend):
+    with pytest.raises(ValueError, match="outlier_backend"):
+        compute_ddct(str(DATA), "CTR", "B-ACTIN", output_path=str(tmp_path / "out.xlsx"), outlier_backend=backend)